@@ -19,8 +19,8 @@ def plot_gradients(
         epoch (int): Current training epoch for labeling the plot.
     """
     # Convert tuples to numpy arrays for plotting
-    true_gradients = [tg.detach().numpy() for tg in true_gradients]
-    predicted_gradients = [pg.detach().numpy() for pg in predicted_gradients]
+    true_gradients = [tg.detach().cpu().numpy() for tg in true_gradients]
+    predicted_gradients = [pg.detach().cpu().numpy() for pg in predicted_gradients]
 
     # Create subplots for each gradient component
     fig, axes = plt.subplots(1, 2, figsize=(10,5))
@@ -12,31 +12,40 @@ import HNN.HNN_utils as HNN_utils
 
 import solvers.explicit_euler as explicit_euler
 import solvers.symplectic_euler as symplectic_euler
+import solvers.leapfrog as leapfrog
+import solvers.leapfrog_numba as leapfrog_numba
 from single_pendulum import hamiltonian
 
+# Run the integration on the GPU if one is available
+DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
 # Convert initial state into a torch tensor
-Y0 = torch.tensor(constants.Y0, dtype=torch.float32)
+Y0 = torch.tensor(constants.Y0, dtype=torch.float32, device=DEVICE)
 T_SPAN = constants.T_SPAN
 
+# Numerical solvers by name, all of them share the signature solve(func, func_type, y0, t_span)
+SOLVERS = {
+    "Explicit Euler": explicit_euler.solve,
+    "Symplectic Euler": symplectic_euler.solve,
+    "Leapfrog": leapfrog.solve,
+    "Leapfrog (Numba)": leapfrog_numba.solve,
+}
+
 def solve_numerically(selected_solver: str) -> None:
     """
     Solve the PDE of the double pendulum numerically with a selected solver.
 
     Args:
-        selected_solver (str): Numerical solver to use. Options: "Explicit Euler", "Symplectic Euler"
+        selected_solver (str): Numerical solver to use. Options: "Explicit Euler", "Symplectic Euler", "Leapfrog", "Leapfrog (Numba)"
 
     Returns:
         None
     """
 
     # Set the numerical solver stated in the selected_solver argument
-    match selected_solver:
-        case "Explicit Euler":
-            func = explicit_euler.solve
-        case "Symplectic Euler":
-            func = symplectic_euler.solve
-        case _:
-            raise ValueError(f"{selected_solver} is not a known solver.")
+    if selected_solver not in SOLVERS:
+        raise ValueError(f"{selected_solver} is not a known solver.")
+    func = SOLVERS[selected_solver]
 
     # Solve PDE for initial state Y0 and time span t_span
     t_values, y_values = func(single_pendulum.vector_field, "_", Y0, T_SPAN)
@@ -47,6 +56,58 @@ def solve_numerically(selected_solver: str) -> None:
     # Plot the Hamiltonian over time to see if it stays constant
     utils.plot_hamiltonian_deviation_over_time(t_values, y_values, selected_solver)
 
+def train_ffnn_model(X_train: torch.Tensor, Y_train: torch.Tensor) -> tuple:
+    """
+    Train a simple FFNN which directly learns the vector field from the data samples.
+
+    Args:
+        X_train (torch.Tensor): Sampled states containing [q, p] (n_samples, 2).
+        Y_train (torch.Tensor): Derivatives at the sampled states containing [dq/dt, dp/dt] (n_samples, 2).
+
+    Returns:
+        tuple: The trained model and the list of loss values for each epoch.
+    """
+    model = FFNN.FFNN(input_dim=2, hidden_dim=128, output_dim=2).to(DEVICE) # Use simple FFNN as model
+    loss_history = FFNN_utils.train_ffnn(
+        model=model,
+        num_epochs=300,
+        X=X_train,
+        Y=Y_train
+    )
+    return model, loss_history
+
+def train_hnn_model(X_train: torch.Tensor, Y_train: torch.Tensor) -> tuple:
+    """
+    Train a HNN which learns the Hamiltonian function from the data samples.
+
+    Args:
+        X_train (torch.Tensor): Sampled states containing [q, p] (n_samples, 2).
+        Y_train (torch.Tensor): Derivatives at the sampled states containing [dq/dt, dp/dt] (n_samples, 2).
+
+    Returns:
+        tuple: The trained model and the list of loss values for each epoch.
+    """
+    # Simulate "measuring" of data points for the supervised (data) loss
+    X_measured = single_pendulum.monte_carlo_sampling(num_samples=10, device=DEVICE)[:, :2]
+    H_measured = hamiltonian(X_measured)
+
+    model = HNN.HNN(input_dim=2, hidden_dim=64, output_dim=1).to(DEVICE) # Use the HNN as model
+    loss_history = HNN_utils.train_hnn(
+        model=model,
+        num_epochs=500,
+        X_train=X_train,
+        Y_train=Y_train,
+        X_measured=X_measured,
+        H_measured=H_measured
+    )
+    return model, loss_history
+
+# Training routines by model name, each one returns the trained model and its loss history
+MODELS = {
+    "FFNN": train_ffnn_model,
+    "HNN": train_hnn_model,
+}
+
 def learn_hamiltonian_and_solve(selected_model: str) -> nn.Module:
     """
     Learn the Hamiltonian function from data and use the learned model to solve the PDE with the Symplectic Euler method.
@@ -57,37 +118,15 @@ def learn_hamiltonian_and_solve(selected_model: str) -> nn.Module:
     Returns:
         nn.Module: The trained model.
     """
+    if selected_model not in MODELS:
+        raise ValueError(f"{selected_model} is not a known model.")
 
-    data_samples = single_pendulum.monte_carlo_sampling(num_samples=1000)  # Generate training data
-    X_train, Y_train = data_samples['states'], data_samples['derivatives']  # Y_train is only used for the FFNN
+    data_samples = single_pendulum.monte_carlo_sampling(num_samples=1000, device=DEVICE)  # Generate training data
+    X_train, Y_train = data_samples[:, :2], data_samples[:, 2:]  # Views into the same allocation
 
     print(f"\n --- Start Training of {selected_model} --- \n")
 
-    match selected_model:
-        case "FFNN":
-            model = FFNN.FFNN(input_dim=2, hidden_dim=128, output_dim=2) # Use simple FFNN as model
-            loss_history = FFNN_utils.train_ffnn(
-                model=model,
-                num_epochs=300,
-                X=X_train,
-                Y=Y_train
-            )
-        case "HNN":
-            # Simulate "measuring" of data points for the supervised (data) loss
-            X_measured = single_pendulum.monte_carlo_sampling(num_samples=10)['states']
-            H_measured = hamiltonian(X_measured)
-
-            model = HNN.HNN(input_dim=2, hidden_dim=64, output_dim=1) # Use the HNN as model
-            loss_history = HNN_utils.train_hnn(
-                model=model,
-                num_epochs=500,
-                X_train=X_train,
-                Y_train=Y_train,
-                X_measured=X_measured,
-                H_measured=H_measured
-            )
-        case _:
-            raise ValueError(f"{selected_model} is not a known solver.")
+    model, loss_history = MODELS[selected_model](X_train, Y_train)
 
     # Plot loss function over the training epochs
     utils.plot_losses(loss_history, selected_model)
@@ -106,7 +145,7 @@ def learn_hamiltonian_and_solve(selected_model: str) -> nn.Module:
 
 if __name__ == '__main__':
     # Set the numerical solver for solving the known PDE
-    use_solver = "Explicit Euler" # Alternatives: "Symplectic Euler" or "Explicit Euler"
+    use_solver = "Explicit Euler" # Alternatives: "Symplectic Euler", "Explicit Euler", "Leapfrog" or "Leapfrog (Numba)"
 
     # Numerically solve the known PDE with the selected solver
     solve_numerically(use_solver)
@@ -12,19 +12,16 @@ def hamiltonian(system_states: torch.Tensor) -> torch.Tensor:
     Compute the Hamiltonian (total energy) of the single pendulum for a tensor of states.
 
     Parameters:
-        system_states: torch.Tensor of shape (N, 2)
+        system_states: torch.Tensor of shape (..., 2)
             - Each row contains [q, p], representing the states of the system.
 
     Returns:
-        H: torch.Tensor of shape (N,)
+        H: torch.Tensor of shape (...)
             - Hamiltonian (total energy) for each state.
     """
     # Extract states
     system_states = system_states.detach()
-    if system_states.ndim == 1:
-        q, p = system_states[0], system_states[1]
-    else:
-        q, p = system_states[:, 0], system_states[:, 1]
+    q, p = system_states[..., 0], system_states[..., 1]
 
     # Kinetic energy (T = p^2 / 2M)
     H_kin = p**2 / (2 * M * L**2)
@@ -43,22 +40,19 @@ def vector_field(system_states: torch.Tensor) -> torch.Tensor:
     Compute the time derivatives (vector field) for the single pendulum for a tensor of states.
 
     Parameters:
-        system_states: torch.Tensor of shape (N, 2) or (2)
+        system_states: torch.Tensor of shape (..., 2)
             - Each row contains [q, p], representing the states of the system.
 
     Returns:
-        derivatives: torch.Tensor of shape (N, 2)
+        derivatives: torch.Tensor of shape (..., 2)
             - Each row contains [dq/dt, dp/dt].
     """
     # Extract states
     system_states = system_states.detach()
-    if system_states.ndim == 1:
-        q, p = system_states[0], system_states[1]
-    else:
-        q, p = system_states[:, 0], system_states[:, 1]
+    q, p = system_states[..., 0], system_states[..., 1]
 
     # Compute time derivatives from Hamilton's equations
-    dq_dt = p / M  # dq/dt = dH_dp
+    dq_dt = p / (M * L**2)  # dq/dt = dH_dp
     dp_dt = -M * G * L * torch.sin(q) # dp_dt = - dH_dq
 
     # Combine derivatives into a single tensor
@@ -67,7 +61,7 @@ def vector_field(system_states: torch.Tensor) -> torch.Tensor:
     return derivatives
 
 # Monte Carlo sampling for the single pendulum
-def monte_carlo_sampling(q_range=(-torch.pi, torch.pi), p_range=(-1, 1), num_samples=1000) -> dict:
+def monte_carlo_sampling(q_range=(-torch.pi, torch.pi), p_range=(-1, 1), num_samples=1000, device="cpu") -> torch.Tensor:
     """
     Generate training data for a Neural Network using Monte Carlo sampling.
 
@@ -78,21 +72,20 @@ def monte_carlo_sampling(q_range=(-torch.pi, torch.pi), p_range=(-1, 1), num_sam
         q_range: Tuple of floats (min, max) defining the range of angles q to sample from
         p_range: Tuple of floats (min, max) defining the range of momenta p to sample from
         num_samples: Number of samples to generate
+        device: Device on which the data is generated, should be the training device
 
     Returns:
-        data: A dictionary with keys 'states' and 'derivatives'
-            - 'states': torch.Tensor of shape (num_samples, 2) containing [q, p]
-            - 'derivatives': torch.Tensor of shape (num_samples, 2) containing [dq/dt, dp/dt]
+        data: torch.Tensor of shape (num_samples, 4) containing [q, p, dq/dt, dp/dt] in a single contiguous allocation
+            - data[:, :2]: the sampled states [q, p]
+            - data[:, 2:]: the derivatives [dq/dt, dp/dt] at the sampled states
     """
-    # Randomly sample states
-    q_samples = torch.empty(num_samples).uniform_(*q_range)
-    p_samples = torch.empty(num_samples).uniform_(*p_range)
+    data = torch.empty(num_samples, 4, device=device)
 
-    # Combine sampled states into a tensor
-    states = torch.stack([q_samples, p_samples], dim=1)
+    # Randomly sample states
+    data[:, 0].uniform_(*q_range)
+    data[:, 1].uniform_(*p_range)
 
     # Compute derivatives for all sampled states using the vectorized `vector_field`
-    derivatives = vector_field(states)
+    data[:, 2:] = vector_field(data[:, :2])
 
-    # Return the data as a dictionary
-    return {'states': states, 'derivatives': derivatives}
+    return data
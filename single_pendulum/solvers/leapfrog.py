@@ -0,0 +1,583 @@
+import math
+import weakref
+from typing import List, Optional
+
+import torch
+import torch.nn as nn
+from torch.utils.checkpoint import checkpoint
+
+# Gradient functions of the learned Hamiltonians, entries are dropped together with their model
+GRAD_HAMILTONIAN_CACHE = weakref.WeakKeyDictionary()
+
+def get_grad_hamiltonian(model: nn.Module):
+    """
+    Build the function which computes dH/dy of the learned Hamiltonian for a batch of states.
+
+    The function is cached per model, so repeated steps with the same model reuse it instead of rebuilding the
+    transforms. It only holds a weak reference to the model, so the cache never keeps a model alive.
+
+    Args:
+        model (nn.Module): Trained Hamiltonian Neural Network (HNN).
+
+    Returns:
+        Callable: Function mapping states of shape (B, 2) to the gradients dH/dy of shape (B, 2).
+    """
+    grad_H_fn = GRAD_HAMILTONIAN_CACHE.get(model)
+    if grad_H_fn is None:
+        model_ref = weakref.ref(model)
+        grad_H_fn = torch.func.vmap(torch.func.grad(lambda y_i: model_ref()(y_i).squeeze()))
+        GRAD_HAMILTONIAN_CACHE[model] = grad_H_fn
+    return grad_H_fn
+
+def get_vector_field(
+        model: nn.Module,
+        y: torch.Tensor
+) -> torch.Tensor:
+    """
+    Calculate the derivatives for the points in the phase space based on the trained HNN.
+
+    The gradient dH/dy is computed functionally with torch.func.grad and vectorized over the batch with
+    torch.func.vmap, so no autograd graph has to be built and torn down in every step.
+
+    Args:
+        model (nn.Module): Trained Hamiltonian Neural Network (HNN).
+        y (torch.Tensor): Current states, a tensor of shape (2) or (B, 2) containing [q, p].
+
+    Returns:
+        torch.Tensor: Tensor of the same shape as y containing [dq/dt, dp/dt].
+    """
+    grad_H = get_grad_hamiltonian(model)(y.reshape(-1, 2)).reshape(y.shape)
+
+    # Extract predicted time derivatives using Hamilton's equations
+    q_dot_pred = grad_H[..., 1]  # ∂H/∂p
+    p_dot_pred = -grad_H[..., 0]  # -∂H/∂q
+
+    return torch.stack([q_dot_pred, p_dot_pred], dim=-1)
+
+def get_vector_field_differentiable(
+        model: nn.Module,
+        y: torch.Tensor
+) -> torch.Tensor:
+    """
+    Calculate the derivatives for the points in the phase space based on the trained HNN and keep them differentiable.
+
+    The torch.func transforms of get_vector_field refuse to run under the saved tensor hooks of gradient checkpointing,
+    so the differentiable solvers compute dH/dy with torch.autograd.grad instead. The graph of the gradient is only
+    kept if gradients are enabled by the caller, e.g. not in the forward pass of the symplectic adjoint.
+
+    Args:
+        model (nn.Module): Trained Hamiltonian Neural Network (HNN).
+        y (torch.Tensor): Current states, a tensor of shape (2) or (B, 2) containing [q, p].
+
+    Returns:
+        torch.Tensor: Tensor of the same shape as y containing [dq/dt, dp/dt].
+    """
+    create_graph = torch.is_grad_enabled()
+
+    with torch.enable_grad():
+        # States which are not part of a graph, e.g. a constant y0, only need a leaf to differentiate H
+        y = y if y.requires_grad else y.detach().requires_grad_(True)
+        H = model(y)
+        grad_H = torch.autograd.grad(H.sum(), y, create_graph=create_graph)[0]
+
+    # Extract predicted time derivatives using Hamilton's equations
+    q_dot_pred = grad_H[..., 1]  # ∂H/∂p
+    p_dot_pred = -grad_H[..., 0]  # -∂H/∂q
+
+    return torch.stack([q_dot_pred, p_dot_pred], dim=-1)
+
+@torch.jit.script
+def kick(
+        y: torch.Tensor,
+        derivatives: torch.Tensor,
+        h: float,
+        out: Optional[torch.Tensor] = None
+) -> torch.Tensor:
+    """
+    Update the momenta (p) of the states with step size h, keeping the positions (q) fixed.
+
+    Args:
+        y (torch.Tensor): Current states, a tensor of shape (2) or (B, 2) containing [q, p].
+        derivatives (torch.Tensor): Derivatives at the current states containing [dq/dt, dp/dt].
+        h (float): Step size.
+        out (torch.Tensor, optional): Buffer of the same shape as y for the updated states, may be y itself.
+            A new tensor is allocated if not given.
+
+    Returns:
+        torch.Tensor: Updated states, a tensor of the same shape as y.
+    """
+    if out is None:
+        out = torch.empty_like(y)
+    out[..., 0] = y[..., 0]
+    out[..., 1] = y[..., 1] + h * derivatives[..., 1]  # dp/dt = -∂H/∂q
+    return out
+
+@torch.jit.script
+def drift(
+        y: torch.Tensor,
+        derivatives: torch.Tensor,
+        h: float,
+        out: Optional[torch.Tensor] = None
+) -> torch.Tensor:
+    """
+    Update the positions (q) of the states with step size h, keeping the momenta (p) fixed.
+
+    Args:
+        y (torch.Tensor): Current states, a tensor of shape (2) or (B, 2) containing [q, p].
+        derivatives (torch.Tensor): Derivatives at the current states containing [dq/dt, dp/dt].
+        h (float): Step size.
+        out (torch.Tensor, optional): Buffer of the same shape as y for the updated states, may be y itself.
+            A new tensor is allocated if not given.
+
+    Returns:
+        torch.Tensor: Updated states, a tensor of the same shape as y.
+    """
+    if out is None:
+        out = torch.empty_like(y)
+    out[..., 0] = y[..., 0] + h * derivatives[..., 0]  # dq/dt = ∂H/∂p
+    out[..., 1] = y[..., 1]
+    return out
+
+def step_plain_fsal(
+        func,
+        y: torch.Tensor,
+        h: float,
+        derivatives: torch.Tensor,
+        out: Optional[torch.Tensor] = None
+) -> tuple:
+    """
+    Perform a single leapfrog (kick-drift-kick) step with the known vector field, reusing the derivatives of the
+    previous step for the first half step (first same as last).
+
+    The reuse is only exact for a separable Hamiltonian H = T(p) + V(q) like the one of the single pendulum,
+    where dp/dt does not depend on p. The closing half step is evaluated at (q_next, p_half) and the next opening
+    half step at (q_next, p_next), which only share dp/dt if it is a function of q alone.
+
+    Args:
+        func (Callable): Known vector field of a separable Hamiltonian system.
+        y (torch.Tensor): Current states, a tensor of shape (2) or (B, 2) containing [q, p].
+        h (float): Step size.
+        derivatives (torch.Tensor): Derivatives returned by the previous step or evaluated for y.
+        out (torch.Tensor, optional): Buffer for the updated states which is written in place. Only usable
+            if the step is not differentiated. Defaults to new tensors for every substep.
+
+    Returns:
+        tuple: A tuple containing:
+            - y_next (torch.Tensor): Updated states, a tensor of the same shape as y.
+            - derivatives_next (torch.Tensor): Derivatives for the first half step of the next step.
+    """
+    y_next = kick(y, derivatives, 0.5 * h, out)
+    y_next = drift(y_next, func(y_next), h, out)
+    derivatives_next = func(y_next)
+    return kick(y_next, derivatives_next, 0.5 * h, out), derivatives_next
+
+def step_hnn(
+        model: nn.Module,
+        y: torch.Tensor,
+        h: float,
+        out: Optional[torch.Tensor] = None
+) -> torch.Tensor:
+    """
+    Perform a single leapfrog (kick-drift-kick) step with the vector field derived from a trained HNN.
+
+    Args:
+        model (nn.Module): Trained Hamiltonian Neural Network (HNN).
+        y (torch.Tensor): Current states, a tensor of shape (2) or (B, 2) containing [q, p].
+        h (float): Step size.
+        out (torch.Tensor, optional): Buffer for the updated states which is written in place. Only usable
+            if the step is not differentiated. Defaults to new tensors for every substep.
+
+    Returns:
+        torch.Tensor: Updated states, a tensor of the same shape as y.
+    """
+    # Every evaluation depends on the previous substep, so they cannot be fused into one call. The gradient
+    # evaluations are batched over all B trajectories instead.
+    y_next = kick(y, get_vector_field(model, y), 0.5 * h, out)
+    y_next = drift(y_next, get_vector_field(model, y_next), h, out)
+    return kick(y_next, get_vector_field(model, y_next), 0.5 * h, out)
+
+def step_hnn_differentiable(
+        model: nn.Module,
+        y: torch.Tensor,
+        h: float
+) -> torch.Tensor:
+    """
+    Perform a single differentiable leapfrog (kick-drift-kick) step with the vector field derived from a trained HNN.
+
+    Args:
+        model (nn.Module): Trained Hamiltonian Neural Network (HNN).
+        y (torch.Tensor): Current states, a tensor of shape (2) or (B, 2) containing [q, p].
+        h (float): Step size.
+
+    Returns:
+        torch.Tensor: Updated states, a tensor of the same shape as y.
+    """
+    y_next = kick(y, get_vector_field_differentiable(model, y), 0.5 * h)
+    y_next = drift(y_next, get_vector_field_differentiable(model, y_next), h)
+    return kick(y_next, get_vector_field_differentiable(model, y_next), 0.5 * h)
+
+class LeapfrogIntegrator(nn.Module):
+    """ Leapfrog integration of a vector field module, which is compiled as a whole with TorchScript """
+    def __init__(self, func: nn.Module):
+        super(LeapfrogIntegrator, self).__init__()
+        self.func = func
+
+    @torch.jit.export
+    def step(self, y: torch.Tensor, h: float, out: Optional[torch.Tensor] = None) -> torch.Tensor:
+        """ Perform a single leapfrog (kick-drift-kick) step, writing into out if it is given """
+        y_next = kick(y, self.func(y), 0.5 * h, out)  # Half step of the momenta based on the current states
+        y_next = drift(y_next, self.func(y_next), h, out)  # Full step of the positions based on the half step momenta
+        return kick(y_next, self.func(y_next), 0.5 * h, out)  # Second half step of the momenta at the updated positions
+
+    def forward(self, y0: torch.Tensor, step_sizes: List[float]) -> torch.Tensor:
+        """ Integrate the states y0 with the given step sizes and return all visited states """
+        y_values = torch.empty([len(step_sizes) + 1] + list(y0.shape), dtype=y0.dtype, device=y0.device)
+        y_values[0] = y0
+
+        for i in range(len(step_sizes)):
+            self.step(y_values[i], step_sizes[i], y_values[i + 1])
+
+        return y_values
+
+# Scripted integrators of the FFNN models by training flags, entries are dropped together with their model
+INTEGRATOR_CACHE = weakref.WeakKeyDictionary()
+
+def get_integrator(model: nn.Module) -> nn.Module:
+    """
+    Build the leapfrog integrator for a model which directly returns the vector field, e.g. the FFNN.
+
+    The integrator is compiled with TorchScript once per model and cached. The compiled copy keeps the training flags
+    of the submodules from the time it was compiled, so a model is compiled again after model.train() or model.eval()
+    and both integrators are cached. Models which TorchScript cannot compile fall back to the same integrator in eager
+    mode, and the failure is cached so that they are not compiled again on every solve.
+
+    Args:
+        model (nn.Module): Trained model that computes the time derivatives (vector field).
+
+    Returns:
+        nn.Module: Integrator with a step method and a forward pass over the complete trajectory.
+    """
+    training_flags = tuple(module.training for module in model.modules())
+    integrators = INTEGRATOR_CACHE.setdefault(model, {})
+
+    if training_flags not in integrators:
+        try:
+            integrators[training_flags] = torch.jit.script(LeapfrogIntegrator(model))
+        except (RuntimeError, torch.jit.frontend.FrontendError):
+            # Only the failure is cached, the eager integrator references the model and would keep it alive
+            integrators[training_flags] = None
+
+    integrator = integrators[training_flags]
+    return LeapfrogIntegrator(model) if integrator is None else integrator
+
+def step_ffnn(
+        model: nn.Module,
+        y: torch.Tensor,
+        h: float,
+        out: Optional[torch.Tensor] = None
+) -> torch.Tensor:
+    """
+    Perform a single leapfrog (kick-drift-kick) step with a model that directly returns the vector field.
+
+    Args:
+        model (nn.Module): Trained model that computes the time derivatives (vector field), e.g. the FFNN.
+        y (torch.Tensor): Current states, a tensor of shape (2) or (B, 2) containing [q, p].
+        h (float): Step size.
+        out (torch.Tensor, optional): Buffer for the updated states which is written in place. Only usable
+            if the step is not differentiated. Defaults to new tensors for every substep.
+
+    Returns:
+        torch.Tensor: Updated states, a tensor of the same shape as y.
+    """
+    return get_integrator(model).step(y, h, out)
+
+# Leapfrog step of the learned models, looked up once per solve so that the integration loop never compares strings.
+# Their vector fields are in general not separable, so they evaluate all three substeps. Only the known vector field
+# of the pendulum reuses the derivatives between steps with step_plain_fsal.
+STEPS = {
+    "HNN": step_hnn,  # Get derivatives from the gradient of the learned Hamiltonian
+    "FFNN": step_ffnn,  # Get derivatives directly from the trained model
+}
+
+# Leapfrog step of the learned models for the differentiable solvers, the HNN gradient is built with autograd
+DIFFERENTIABLE_STEPS = {
+    "HNN": step_hnn_differentiable,
+    "FFNN": step_ffnn,
+}
+
+def time_grid(t_span: tuple, h: float) -> list:
+    """
+    Compute the time points of the integration, the last step is shortened to end exactly at t_end.
+
+    Args:
+        t_span (tuple): A tuple (t_start, t_end) defining the time interval.
+        h (float): Step size.
+
+    Returns:
+        list: Time points from t_start to t_end.
+    """
+    t_start, t_end = t_span
+    num_steps = math.ceil((t_end - t_start) / h)
+    return [min(t_start + i * h, t_end) for i in range(num_steps + 1)]
+
+def solve(
+        func,
+        func_type: str,
+        y0: torch.Tensor,
+        t_span: tuple,
+        h: float = 0.01
+) -> tuple:
+    """
+    Solve the system of ODEs using the leapfrog method.
+
+    All B initial states are advanced in lockstep, so every step is a single batched evaluation of the
+    vector field instead of B separate ones. The trajectory is stored on the device of y0, so the model
+    and the states stay on the GPU for the whole integration when y0 is a CUDA tensor.
+
+    Args:
+        func (Union[nn.Module, Callable]): Function or model that computes the time derivatives (vector field).
+        func_type (str): Either "HNN", "FFNN" or "_" for vector_field
+        y0 (torch.Tensor): Initial states, a tensor of shape (2) or (B, 2) containing [q, p].
+        t_span (tuple): A tuple (t_start, t_end) defining the time interval.
+        h (float, optional): Step size. Defaults to 0.01.
+
+    Returns:
+        tuple: A tuple containing:
+            - t_values (torch.Tensor): Tensor of time points of shape (N).
+            - y_values (torch.Tensor): Tensor of state values at the corresponding time points of shape (N, *y0.shape).
+    """
+    if func_type != "_" and func_type not in STEPS:
+        raise ValueError(f"{func_type} is not a known function type.")
+
+    t_points = time_grid(t_span, h)
+
+    t_values = torch.tensor(t_points, dtype=torch.float32, device=y0.device)
+
+    if func_type == "FFNN":
+        # The complete integration loop including the FFNN is compiled with TorchScript once per model
+        integrator = get_integrator(func)
+        step_sizes = [t_next - t for t, t_next in zip(t_points[:-1], t_points[1:])]
+        with torch.no_grad():
+            return t_values, integrator(y0, step_sizes)
+
+    # Preallocate the trajectory on the device of the initial states instead of collecting the states in lists
+    y_values = torch.empty((len(t_points), *y0.shape), dtype=y0.dtype, device=y0.device)
+
+    # The trajectory is not differentiated, torch.func.grad of the HNN still works inside no_grad
+    with torch.no_grad():
+        y_values[0] = y0
+
+        if func_type == "_":
+            # The known vector field is separable, so the derivatives are carried over between the steps
+            derivatives = func(y0)
+            for i in range(1, len(t_points)):
+                _, derivatives = step_plain_fsal(func, y_values[i - 1], t_points[i] - t_points[i - 1], derivatives, y_values[i])
+        else:
+            step_fn = STEPS[func_type]
+            for i in range(1, len(t_points)):
+                # Perform a single leapfrog step for all states and write the result directly into the trajectory
+                step_fn(func, y_values[i - 1], t_points[i] - t_points[i - 1], y_values[i])
+
+    return t_values, y_values
+
+def solve_checkpointed(
+        func,
+        func_type: str,
+        y0: torch.Tensor,
+        t_span: tuple,
+        h: float = 0.01,
+        segment_length: Optional[int] = None
+) -> tuple:
+    """
+    Solve the system of ODEs using the leapfrog method and keep the trajectory differentiable, e.g. for a trajectory loss.
+
+    The steps are grouped into segments which are wrapped in gradient checkpoints. Only the states at the segment
+    boundaries are kept for the backward pass and the graph inside a segment is recomputed when it is needed.
+    With the default segment length of about sqrt(N) steps the memory of the graph grows with O(sqrt(N)) instead of O(N).
+
+    Args:
+        func (nn.Module): Trained model that computes the time derivatives (vector field).
+        func_type (str): Either "HNN" or "FFNN". The known vector_field detaches its input and is not supported.
+        y0 (torch.Tensor): Initial states, a tensor of shape (2) or (B, 2) containing [q, p].
+        t_span (tuple): A tuple (t_start, t_end) defining the time interval.
+        h (float, optional): Step size. Defaults to 0.01.
+        segment_length (int, optional): Number of steps per checkpointed segment. Defaults to sqrt(N).
+
+    Returns:
+        tuple: A tuple containing:
+            - t_values (torch.Tensor): Tensor of time points of shape (N).
+            - y_values (torch.Tensor): Differentiable tensor of state values of shape (N, *y0.shape).
+    """
+    if func_type not in DIFFERENTIABLE_STEPS:
+        raise ValueError(f"{func_type} is not differentiable, only the HNN and FFNN can be used with checkpointing.")
+
+    t_points = time_grid(t_span, h)
+    step_sizes = [t_next - t for t, t_next in zip(t_points[:-1], t_points[1:])]
+
+    if segment_length is None:
+        segment_length = max(1, math.isqrt(len(step_sizes)))
+
+    step_fn = DIFFERENTIABLE_STEPS[func_type]
+
+    def run_segment(y: torch.Tensor, segment_step_sizes: list) -> torch.Tensor:
+        # Perform the leapfrog steps of one segment and return all visited states
+        states = []
+        for h_i in segment_step_sizes:
+            y = step_fn(func, y, h_i)
+            states.append(y)
+        return torch.stack(states)
+
+    y = y0
+    y_segments = [y0.unsqueeze(0)]
+    for start in range(0, len(step_sizes), segment_length):
+        states = checkpoint(run_segment, y, step_sizes[start:start + segment_length], use_reentrant=False)
+        y = states[-1]
+        y_segments.append(states)
+
+    return torch.tensor(t_points, dtype=torch.float32, device=y0.device), torch.cat(y_segments)
+
+class LeapfrogSymplecticAdjoint(torch.autograd.Function):
+    """
+    Leapfrog solve which is differentiated with the symplectic adjoint method instead of storing the autograd graph.
+
+    The forward pass integrates without building a graph. The backward pass integrates the adjoint variable backwards
+    in time with the transposed Jacobian of the very same leapfrog steps, which gives the exact gradient for the step
+    size of the forward pass. Only the graph of a single step is alive at any time.
+    """
+
+    @staticmethod
+    def forward(ctx, y0: torch.Tensor, func, step_fn, step_sizes: list, *params: torch.Tensor) -> torch.Tensor:
+        # Integrate forward without a graph, the visited states serve as checkpoints for the backward pass
+        y_values = torch.empty((len(step_sizes) + 1, *y0.shape), dtype=y0.dtype, device=y0.device)
+        y = y0
+        y_values[0] = y
+        for i, h_i in enumerate(step_sizes):
+            y = step_fn(func, y, h_i)
+            y_values[i + 1] = y
+
+        ctx.func, ctx.step_fn, ctx.step_sizes = func, step_fn, step_sizes
+        ctx.save_for_backward(y_values, *params)
+        return y_values
+
+    @staticmethod
+    def backward(ctx, grad_y_values: torch.Tensor) -> tuple:
+        y_values, *params = ctx.saved_tensors
+        grad_params = [torch.zeros_like(param) for param in params]
+
+        # Adjoint variable λ = dL/dy at the final state
+        adjoint = grad_y_values[-1]
+
+        with torch.enable_grad():
+            for n in reversed(range(len(ctx.step_sizes))):
+                # Recompute the step from the stored state and apply its transposed Jacobian to λ
+                y = y_values[n].detach().requires_grad_(True)
+                y_next = ctx.step_fn(ctx.func, y, ctx.step_sizes[n])
+                grads = torch.autograd.grad(y_next, (y, *params), grad_outputs=adjoint, allow_unused=True)
+
+                # λ_n = (∂y_{n+1}/∂y_n)^T λ_{n+1} + dL/dy_n
+                adjoint = grads[0] + grad_y_values[n]
+                for grad_param, grad in zip(grad_params, grads[1:]):
+                    if grad is not None:
+                        grad_param += grad
+
+        return (adjoint, None, None, None, *grad_params)
+
+def solve_adjoint(
+        func,
+        func_type: str,
+        y0: torch.Tensor,
+        t_span: tuple,
+        h: float = 0.01
+) -> tuple:
+    """
+    Solve the system of ODEs using the leapfrog method and differentiate it with the symplectic adjoint method.
+
+    Args:
+        func (nn.Module): Trained model that computes the time derivatives (vector field).
+        func_type (str): Either "HNN" or "FFNN". The known vector_field detaches its input and is not supported.
+        y0 (torch.Tensor): Initial states, a tensor of shape (2) or (B, 2) containing [q, p].
+        t_span (tuple): A tuple (t_start, t_end) defining the time interval.
+        h (float, optional): Step size. Defaults to 0.01.
+
+    Returns:
+        tuple: A tuple containing:
+            - t_values (torch.Tensor): Tensor of time points of shape (N).
+            - y_values (torch.Tensor): Differentiable tensor of state values of shape (N, *y0.shape).
+    """
+    if func_type not in DIFFERENTIABLE_STEPS:
+        raise ValueError(f"{func_type} is not differentiable, only the HNN and FFNN can be used with the adjoint method.")
+
+    t_points = time_grid(t_span, h)
+    step_sizes = [t_next - t for t, t_next in zip(t_points[:-1], t_points[1:])]
+
+    # Pass the model parameters explicitly so that autograd hands their gradients to the backward pass
+    params = [param for param in func.parameters() if param.requires_grad]
+    y_values = LeapfrogSymplecticAdjoint.apply(y0, func, DIFFERENTIABLE_STEPS[func_type], step_sizes, *params)
+
+    return torch.tensor(t_points, dtype=torch.float32, device=y0.device), y_values
+
+def check_gradients(
+        func: nn.Module,
+        func_type: str,
+        y0: torch.Tensor,
+        t_span: tuple,
+        h: float = 0.01
+) -> dict:
+    """
+    Compare the gradients of the checkpointed and the adjoint solver with plain autograd through an unrolled loop.
+
+    The loss is the sum of all visited states, its gradients with respect to y0 and the model parameters are compared.
+
+    Args:
+        func (nn.Module): Trained model that computes the time derivatives (vector field).
+        func_type (str): Either "HNN" or "FFNN".
+        y0 (torch.Tensor): Initial states, a tensor of shape (2) or (B, 2) containing [q, p].
+        t_span (tuple): A tuple (t_start, t_end) defining the time interval.
+        h (float, optional): Step size. Defaults to 0.01.
+
+    Returns:
+        dict: Largest absolute deviation from the unrolled gradients for "checkpointed" and "adjoint".
+    """
+    if func_type not in DIFFERENTIABLE_STEPS:
+        raise ValueError(f"{func_type} is not differentiable, only the HNN and FFNN gradients can be checked.")
+
+    t_points = time_grid(t_span, h)
+    inputs = [y0.detach().clone().requires_grad_(True), *func.parameters()]
+
+    def gradients(y_values: torch.Tensor) -> list:
+        return torch.autograd.grad(y_values.sum(), inputs, allow_unused=True)
+
+    # Reference: autograd through every step of an unrolled loop
+    y = inputs[0]
+    states = [y]
+    for i in range(1, len(t_points)):
+        y = DIFFERENTIABLE_STEPS[func_type](func, y, t_points[i] - t_points[i - 1])
+        states.append(y)
+    reference = gradients(torch.stack(states))
+
+    deviations = {}
+    for name, solver in [("checkpointed", solve_checkpointed), ("adjoint", solve_adjoint)]:
+        _, y_values = solver(func, func_type, inputs[0], t_span, h)
+        deviations[name] = max(
+            (grad - grad_ref).abs().max().item()
+            for grad, grad_ref in zip(gradients(y_values), reference)
+            if grad_ref is not None
+        )
+    return deviations
+
+if __name__ == '__main__':
+    # Run from the single_pendulum directory with: python -m solvers.leapfrog
+    import FFNN.FFNN as FFNN
+    import HNN.HNN as HNN
+
+    torch.manual_seed(0)
+    y0 = torch.randn(4, 2, dtype=torch.float64)
+    models = {
+        "HNN": HNN.HNN(input_dim=2, hidden_dim=16, output_dim=1).double(),
+        "FFNN": FFNN.FFNN(input_dim=2, hidden_dim=16, output_dim=2).double(),
+    }
+
+    for model_type, model in models.items():
+        deviations = check_gradients(model, model_type, y0, (0.0, 0.5), h=0.05)
+        print(f"{model_type}: {deviations}")
+        assert all(deviation < 1e-8 for deviation in deviations.values()), f"Gradients of {model_type} do not match"
@@ -0,0 +1,96 @@
+import math
+
+import numpy as np
+import torch
+from numba import njit
+
+import constants
+
+@njit(cache=True, fastmath=True)
+def solve_nb(
+        y0: np.ndarray,
+        t0: float,
+        t1: float,
+        h: float,
+        M: float,
+        L: float,
+        g: float
+) -> tuple:
+    """
+    Solve the equations of motion of the single pendulum with the leapfrog method in compiled native code.
+
+    The vector field of the pendulum is inlined, so every step only consists of a few scalar operations.
+
+    Args:
+        y0 (np.ndarray): Initial states, an array of shape (B, 2) containing [q, p].
+        t0 (float): Start time.
+        t1 (float): End time.
+        h (float): Step size.
+        M (float): Mass of the pendulum.
+        L (float): Length of the pendulum.
+        g (float): Gravitational constant.
+
+    Returns:
+        tuple: A tuple containing:
+            - t_values (np.ndarray): Array of time points of shape (N).
+            - y_values (np.ndarray): Array of state values at the corresponding time points of shape (N, B, 2).
+    """
+    num_steps = math.ceil((t1 - t0) / h)
+
+    t_values = np.empty(num_steps + 1)
+    for i in range(num_steps + 1):
+        t_values[i] = min(t0 + i * h, t1)  # Ensure we don't step past the end time
+
+    y_values = np.empty((num_steps + 1, y0.shape[0], 2))
+    for b in range(y0.shape[0]):
+        q, p = y0[b, 0], y0[b, 1]
+        y_values[0, b, 0], y_values[0, b, 1] = q, p
+
+        for i in range(1, num_steps + 1):
+            h_i = t_values[i] - t_values[i - 1]
+
+            p_half = p - 0.5 * h_i * M * g * L * math.sin(q)  # dp/dt = -∂H/∂q
+            q = q + h_i * p_half / (M * L ** 2)  # dq/dt = ∂H/∂p
+            p = p_half - 0.5 * h_i * M * g * L * math.sin(q)
+
+            y_values[i, b, 0], y_values[i, b, 1] = q, p
+
+    return t_values, y_values
+
+def solve(
+        func,
+        func_type: str,
+        y0: torch.Tensor,
+        t_span: tuple,
+        h: float = 0.01
+) -> tuple:
+    """
+    Solve the known PDE of the single pendulum using the Numba compiled leapfrog method.
+
+    The signature matches the other solvers, but only the known vector field of the single pendulum is supported
+    since it is compiled into the solver.
+
+    Args:
+        func (Callable): Known vector field, it is inlined in the compiled solver and not called.
+        func_type (str): Has to be "_" for vector_field
+        y0 (torch.Tensor): Initial states, a tensor of shape (2) or (B, 2) containing [q, p].
+        t_span (tuple): A tuple (t_start, t_end) defining the time interval.
+        h (float, optional): Step size. Defaults to 0.01.
+
+    Returns:
+        tuple: A tuple containing:
+            - t_values (torch.Tensor): Tensor of time points of shape (N).
+            - y_values (torch.Tensor): Tensor of state values at the corresponding time points of shape (N, *y0.shape).
+    """
+    if func_type != "_":
+        raise ValueError(f"The Numba leapfrog solver only supports the known vector field, not {func_type}.")
+
+    t_start, t_end = t_span
+    y0_np = y0.detach().cpu().numpy().astype(np.float64).reshape(-1, 2)
+
+    t_values, y_values = solve_nb(y0_np, t_start, t_end, h, constants.M, constants.L, constants.G)
+
+    # Return the trajectory on the device of the initial states like the other solvers
+    t_values = torch.from_numpy(t_values).to(dtype=torch.float32, device=y0.device)
+    y_values = torch.from_numpy(y_values).to(dtype=y0.dtype, device=y0.device).reshape(-1, *y0.shape)
+    return t_values, y_values
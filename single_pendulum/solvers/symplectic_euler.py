@@ -1,6 +1,8 @@
 import torch
 import torch.nn as nn
 
+from solvers.leapfrog import time_grid
+
 def get_vector_field(
         model: nn.Module,
         y: torch.Tensor
@@ -15,12 +17,14 @@ def get_vector_field(
     Returns:
         torch.Tensor: Tensor of shape (2) containing [dq/dt, dp/dt].
     """
+    # A graph for higher order derivatives is only needed if the caller differentiates the result
+    create_graph = torch.is_grad_enabled() and y.requires_grad
     y = y.detach().clone().requires_grad_(True)
 
     model.eval()
-    H = model(y)
-
-    grad_H = torch.autograd.grad(H, y, grad_outputs=torch.ones_like(H), create_graph=True)[0]
+    with torch.enable_grad():
+        H = model(y)
+        grad_H = torch.autograd.grad(H, y, grad_outputs=torch.ones_like(H), create_graph=create_graph)[0]
 
     # Extract predicted time derivatives using Hamilton's equations
     q_dot_pred = grad_H[1]  # ∂H/∂p
@@ -83,25 +87,20 @@ def solve(func, func_type: str, y0: torch.Tensor, t_span: tuple, h: float = 0.01
             - t_values (torch.Tensor): Tensor of time points.
             - y_values (torch.Tensor): Tensor of state values at the corresponding time points.
     """
-    t_start, t_end = t_span
-    t = t_start
-    y = y0.clone().detach()
+    t_points = time_grid(t_span, h)
 
-    t_values = [t]
-    y_values = [y.clone().detach()]
+    # Preallocate the trajectory instead of collecting the states in lists, the time points are copied in one go
+    t_values = torch.tensor(t_points, dtype=torch.float32, device=y0.device)
+    y_values = torch.empty((len(t_points), *y0.shape), dtype=y0.dtype, device=y0.device)
 
-    while t < t_end:
-        # Ensure we don't step past the end time
-        if t + h > t_end:
-            h = t_end - t
+    y = y0.detach()
+    y_values[0] = y
 
-        # Perform a single symplectic Euler step
-        y = step(func, func_type, y, h)
-        t += h
+    for i in range(1, len(t_points)):
+        # Perform a single symplectic Euler step, the last step is shortened to end exactly at t_end
+        y = step(func, func_type, y, t_points[i] - t_points[i - 1]).detach()
 
         # Store the results
-        t_values.append(t)
-        y_values.append(y.clone().detach())
-
-    return torch.tensor(t_values, dtype=torch.float32), torch.stack(y_values)
+        y_values[i] = y
 
+    return t_values, y_values
@@ -18,8 +18,8 @@ def plot_positions_in_cartesian(t: np.array, y: np.array, title: str):
         title: Title of the plot.
     """
 
-    # Extract the angle values (q) from the state vector y
-    q = y[:, 0]  # Angle of the pendulum
+    # Extract the angle values (q) from the state vector y, the solvers may return the trajectory on the GPU
+    q = y[:, 0].cpu()  # Angle of the pendulum
 
     # Calculate the Cartesian coordinates for the pendulum
     x = L * np.sin(q)
@@ -40,24 +40,26 @@ def plot_positions_in_cartesian(t: np.array, y: np.array, title: str):
     plt.axis('equal')
     plt.show()
 
-def plot_hamiltonian_deviation_over_time(t: np.array, y: torch.tensor, title: str):
+def plot_hamiltonian_deviation_over_time(t: torch.tensor, y: torch.tensor, title: str):
     """
     Plot the relative deviation in the value of the Hamiltonian function compared to t=0 over time.
 
     Parameters:
-        t (np.array): Array of time values.
-        y (tensor.torch): Tensor of state values, where each row is [p, q] at a given time step.
+        t (torch.tensor): Tensor of time values, on any device.
+        y (tensor.torch): Tensor of state values on any device, where each row is [p, q] at a given time step.
         title: Title of the plot.
     """
 
-    h = hamiltonian(y)  # Calculate the value of the Hamiltonian based on the system states y
-    h0 = h[0]  # Capture initial state for relative deviation
+    with torch.inference_mode():
+        h = hamiltonian(y)  # Calculate the value of the Hamiltonian based on the system states y
+        h0 = h[0]  # Capture initial state for relative deviation
 
-    deviation = np.abs(h0 - h) / np.abs(h0)  # Compute the relative deviation
+        # Compute the relative deviation in torch, reusing the buffer of the difference for the result
+        deviation = (h0 - h).abs_().div_(h0.abs())
 
     # Create the plot
     plt.figure(figsize=(10, 6))
-    plt.plot(t, deviation)
+    plt.plot(t.cpu(), deviation.cpu().numpy())  # Move the values back to the host for plotting
     plt.xlabel('t')
     plt.ylabel('Rel. Deviation')
     plt.title(f'Relative Deviation of the Hamiltonian Function over Time for {title} solution')
@@ -88,16 +90,20 @@ def compare_hamiltonian_single_pendulum(model: nn.Module) -> None:
     Args:
         model (nn.Module): Learned Hamiltonian.
     """
-    p_values = np.linspace(-1, 1, 100)
-    q_values = np.linspace(-np.pi, np.pi, 100)
-    P, Q = np.meshgrid(p_values, q_values)
+    # Build the grid of system states directly on the device of the model
+    device = next(model.parameters()).device
+    p_values = torch.linspace(-1, 1, 100, device=device)
+    q_values = torch.linspace(-torch.pi, torch.pi, 100, device=device)
+    Q, P = torch.meshgrid(q_values, p_values, indexing='xy')
 
-    P_flat = torch.tensor(P.flatten(), dtype=torch.float32)
-    Q_flat = torch.tensor(Q.flatten(), dtype=torch.float32)
+    system_states = torch.stack([Q.reshape(-1), P.reshape(-1)], dim=1)
 
-    system_states = torch.stack([Q_flat, P_flat], dim=1)
-    H_true = hamiltonian(system_states).reshape(100, 100).numpy()
-    H_learned = model(system_states).reshape(100, 100).detach().numpy()
+    # Evaluate the true and the learned Hamiltonian for all grid points without autograd tracking
+    with torch.inference_mode():
+        H_true = hamiltonian(system_states).view(100, 100).cpu().numpy()
+        H_learned = model(system_states).view(100, 100).cpu().numpy()
+
+    Q, P = Q.cpu().numpy(), P.cpu().numpy()
 
     fig, axes = plt.subplots(1, 2, figsize=(12, 6), subplot_kw={"projection": "3d"})
 